@@ -1,24 +1,36 @@
 import streamlit as st
-from openbb import obb
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 import datetime
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
+from openbb_core.provider.utils.errors import EmptyDataError
 import os
 import io
+import math
 import tempfile
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.lib.utils import ImageReader
-from PIL import Image
+import atexit
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
-# set environment variable
-obb.user.credentials.fmp_api_key = os.getenv("FMP_API_KEY")
+
+# Configure the OpenBB client once per server process rather than on every rerun
+@st.cache_resource
+def get_obb():
+    from openbb import obb
+
+    # set environment variable
+    obb.user.credentials.fmp_api_key = os.getenv("FMP_API_KEY")
+    return obb
+
+
 st.set_page_config(page_title="OpenBB Financial Dashboard", layout="wide")
+obb = get_obb()
 
 # Add OpenBB Dashboard Header and Description
 st.sidebar.image(
@@ -60,15 +72,92 @@ start_date = st.sidebar.date_input("Start Date", datetime.date(2023, 1, 1))
 end_date = st.sidebar.date_input("End Date", datetime.date.today())
 
 
-@st.cache_data
+# Closing prices for one symbol; a window with no sessions in it (a weekend, a holiday,
+# today before the open) comes back as an empty frame rather than an error
+def fetch_close_history(symbol, start_date, end_date):
+    try:
+        data = obb.equity.price.historical(
+            symbol=symbol,
+            start_date=start_date.strftime("%Y-%m-%d"),
+            end_date=end_date.strftime("%Y-%m-%d"),
+        ).to_dataframe()
+    except EmptyDataError:
+        return pd.DataFrame({"close": pd.Series(dtype=np.float64)})
+    return data[["close"]]
+
+
+# Today's date on the exchange, so a session still trading on a server in another
+# timezone is never taken for a closed one
+def exchange_today():
+    return datetime.datetime.now(ZoneInfo("America/New_York")).date()
+
+
+# Closed sessions are persisted across restarts as one window per request. The key
+# includes the day it was fetched for, so once a new session closes (or a split
+# re-adjusts past prices) the whole window is fetched again on a single price scale.
+@st.cache_data(persist="disk", show_spinner=False)
+def fetch_closed_history(symbol, start_date, end_date, as_of):
+    return fetch_close_history(symbol, start_date, end_date)
+
+
+# Today's bar is still moving, so it is only cached briefly in memory
+@st.cache_data(ttl=datetime.timedelta(minutes=5), show_spinner=False)
+def fetch_live_history(symbol, start_date, end_date):
+    return fetch_close_history(symbol, start_date, end_date)
+
+
+@st.cache_resource
+def closed_history_state():
+    return {"as_of": None}
+
+
+# Streamlit never deletes persisted cache files, and every closed window goes stale
+# when a new session closes, so drop them all from disk when the day rolls over
+def expire_closed_history():
+    state = closed_history_state()
+    as_of = exchange_today() - datetime.timedelta(days=1)
+    if state["as_of"] not in (None, as_of):
+        fetch_closed_history.clear()
+    state["as_of"] = as_of
+
+
+def fetch_history(symbol, start_date, end_date):
+    yesterday = exchange_today() - datetime.timedelta(days=1)
+    last_closed = min(end_date, yesterday)
+    segments = []
+    if start_date <= last_closed:
+        segments.append(
+            fetch_closed_history(symbol, start_date, last_closed, yesterday)
+        )
+    if end_date > last_closed:
+        live_start = max(start_date, last_closed + datetime.timedelta(days=1))
+        segments.append(fetch_live_history(symbol, live_start, end_date))
+    segments = [segment for segment in segments if not segment.empty]
+    if not segments:
+        raise EmptyDataError(
+            f"No price data for {symbol} between {start_date} and {end_date}."
+        )
+    data = pd.concat(segments)
+    return data[~data.index.duplicated(keep="last")]
+
+
 def fetch_stock_data(ticker, start_date, end_date):
-    data = obb.equity.price.historical(
-        symbol=ticker,
-        start_date=start_date.strftime("%Y-%m-%d"),
-        end_date=end_date.strftime("%Y-%m-%d"),
-    ).to_dataframe()
-    return data
+    return fetch_history(ticker, start_date, end_date)
+
+
+# Fetch closing prices for several symbols concurrently; the calls are network-bound
+def fetch_close_prices(symbols, start_date, end_date=None):
+    end_date = end_date or exchange_today()
+
+    def fetch_close(symbol):
+        return fetch_history(symbol, start_date, end_date)["close"]
 
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+        closes = list(executor.map(fetch_close, symbols))
+    return pd.concat(closes, axis=1, keys=symbols)
+
+
+expire_closed_history()
 
 try:
     stock_data = fetch_stock_data(ticker, start_date, end_date)
@@ -78,20 +167,28 @@ except Exception as e:
     st.stop()
 
 st.title(f"Stock Analysis for {ticker}")
-st.subheader("Closing Price Chart")
 
-fig_price = px.line(
-    stock_data,
-    x=stock_data.index,
-    y="close",
-    labels={"close": "Price", "index": "Date"},
-)
-st.plotly_chart(fig_price, use_container_width=True)
 
-# Save the chart to an image for export
-with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp:
-    fig_price.write_image(temp.name)
-    price_chart_path = temp.name
+# Plain datetime64 arrays serialise much faster than an index of Timestamp objects
+def chart_dates(index):
+    return pd.to_datetime(index).values
+
+
+# Figures are cached as plain dicts so reruns with unchanged data skip rebuilding them
+@st.cache_data
+def build_price_figure(data):
+    fig = px.line(
+        data,
+        x=chart_dates(data.index),
+        y="close",
+        labels={"close": "Price", "x": "Date"},
+    )
+    return fig.to_dict()
+
+
+st.subheader("Closing Price Chart")
+fig_price = go.Figure(build_price_figure(stock_data[["close"]]))
+st.plotly_chart(fig_price, use_container_width=True)
 
 # Technical Analysis
 st.sidebar.subheader("Technical Indicators")
@@ -99,105 +196,151 @@ ma_periods = st.sidebar.multiselect(
     "Select Moving Averages", [5, 10, 20, 50, 100, 200], default=[20, 50]
 )
 
-for period in ma_periods:
-    stock_data[f"MA_{period}"] = stock_data["close"].rolling(window=period).mean()
 
-st.subheader("Price with Moving Averages")
-fig_ma = go.Figure()
-fig_ma.add_trace(
-    go.Scatter(x=stock_data.index, y=stock_data["close"], name="Close Price")
-)
+# Cumulative sum with a leading zero, so any window sum is a single subtraction.
+# NaNs are summed as zero and counted separately so they only spoil their own windows.
+def prefix_sum(values):
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    counts = np.concatenate(([0], np.cumsum(missing)))
+    return sums, counts
+
+
+# Trailing window sums from a prefix sum, NaN until the first full window and
+# for any window that contains a missing value
+def window_sum(prefix, window):
+    sums, counts = prefix
+    window_sums = np.full(len(sums) - 1, np.nan)
+    if 0 < window < len(sums):
+        full = window_sums[window - 1 :]
+        full[:] = sums[window:] - sums[:-window]
+        full[counts[window:] - counts[:-window] > 0] = np.nan
+    return window_sums
+
 
+close_prefix = prefix_sum(stock_data["close"].to_numpy())
 for period in ma_periods:
-    fig_ma.add_trace(
-        go.Scatter(
-            x=stock_data.index, y=stock_data[f"MA_{period}"], name=f"MA {period}"
-        )
-    )
+    stock_data[f"MA_{period}"] = window_sum(close_prefix, period) / period
 
-st.plotly_chart(fig_ma, use_container_width=True)
 
-# Save the chart to an image for export
-with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp:
-    fig_ma.write_image(temp.name)
-    ma_chart_path = temp.name
+@st.cache_data
+def build_ma_figure(data, ma_periods):
+    dates = chart_dates(data.index)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=dates, y=data["close"], name="Close Price"))
+
+    for period in ma_periods:
+        fig.add_trace(go.Scatter(x=dates, y=data[f"MA_{period}"], name=f"MA {period}"))
+    return fig.to_dict()
+
+
+st.subheader("Price with Moving Averages")
+ma_columns = ["close"] + [f"MA_{period}" for period in ma_periods]
+fig_ma = go.Figure(build_ma_figure(stock_data[ma_columns], tuple(ma_periods)))
+st.plotly_chart(fig_ma, use_container_width=True)
 
 
 # Bollinger Bands
 def calculate_bollinger_bands(data, window=20):
-    data["MA"] = data["close"].rolling(window=window).mean()
-    data["STD"] = data["close"].rolling(window=window).std()
-    data["Upper"] = data["MA"] + (data["STD"] * 2)
-    data["Lower"] = data["MA"] - (data["STD"] * 2)
+    close = data["close"].to_numpy()
+    # Centre the prices so the running sum of squares keeps its precision
+    offset = np.nanmean(close, dtype=np.float64)
+    centred = close - offset
+    sums = window_sum(prefix_sum(centred), window)
+    sq_sums = window_sum(prefix_sum(centred * centred), window)
+    variance = (sq_sums - sums * sums / window) / (window - 1)
+    std = np.sqrt(np.clip(variance, 0, None))
+    # Reuse the matching moving average when it has already been selected
+    ma_column = f"MA_{window}"
+    if ma_column in data.columns:
+        ma = data[ma_column].to_numpy()
+    else:
+        ma = sums / window + offset
+    data["Upper"] = ma + (std * 2)
+    data["Lower"] = ma - (std * 2)
     return data
 
 
 stock_data = calculate_bollinger_bands(stock_data)
 
-st.subheader("Bollinger Bands")
-fig_bb = go.Figure()
-fig_bb.add_trace(
-    go.Scatter(
-        x=stock_data.index,
-        y=stock_data["Upper"],
-        name="Upper Band",
-        line=dict(color="rgba(173,216,230,0.2)"),
+
+@st.cache_data
+def build_bb_figure(data):
+    dates = chart_dates(data.index)
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=data["Upper"],
+            name="Upper Band",
+            line=dict(color="rgba(173,216,230,0.2)"),
+        )
     )
-)
-fig_bb.add_trace(
-    go.Scatter(
-        x=stock_data.index,
-        y=stock_data["Lower"],
-        name="Lower Band",
-        fill="tonexty",
-        fillcolor="rgba(173,216,230,0.2)",
-        line=dict(color="rgba(173,216,230,0.2)"),
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=data["Lower"],
+            name="Lower Band",
+            fill="tonexty",
+            fillcolor="rgba(173,216,230,0.2)",
+            line=dict(color="rgba(173,216,230,0.2)"),
+        )
     )
-)
-fig_bb.add_trace(
-    go.Scatter(
-        x=stock_data.index,
-        y=stock_data["close"],
-        name="Close Price",
-        line=dict(color="blue"),
+    fig.add_trace(
+        go.Scatter(
+            x=dates,
+            y=data["close"],
+            name="Close Price",
+            line=dict(color="blue"),
+        )
     )
-)
+    return fig.to_dict()
 
-st.plotly_chart(fig_bb, use_container_width=True)
 
-# Save the chart to an image for export
-with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp:
-    fig_bb.write_image(temp.name)
-    bb_chart_path = temp.name
+st.subheader("Bollinger Bands")
+fig_bb = go.Figure(build_bb_figure(stock_data[["Upper", "Lower", "close"]]))
+st.plotly_chart(fig_bb, use_container_width=True)
 
 
-# RSI
+# RSI with Wilder's smoothing, seeded by the simple average of the first window
 def calculate_rsi(data, periods=14):
-    delta = data["close"].diff()
-    gain = delta.clip(lower=0)
-    loss = -1 * delta.clip(upper=0)
-    avg_gain = gain.ewm(com=(periods - 1), min_periods=periods).mean()
-    avg_loss = loss.ewm(com=(periods - 1), min_periods=periods).mean()
-    rs = avg_gain / avg_loss
-    data["RSI"] = 100 - (100 / (1 + rs))
+    delta = np.diff(data["close"].to_numpy(), prepend=np.nan)
+    moves = np.column_stack((np.clip(delta, 0, None), np.clip(-delta, 0, None)))
+    rsi = np.full(len(moves), np.nan)
+    if len(moves) > periods:
+        # Gains and losses are smoothed together in one recursive pass
+        moves[periods] = moves[1 : periods + 1].mean(axis=0)
+        averages = (
+            pd.DataFrame(moves[periods:])
+            .ewm(alpha=1 / periods, adjust=False)
+            .mean()
+            .to_numpy()
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi[periods:] = 100 - (100 / (1 + averages[:, 0] / averages[:, 1]))
+    data["RSI"] = rsi
     return data
 
 
 stock_data = calculate_rsi(stock_data)
+stock_returns = stock_data["close"].pct_change().dropna().to_numpy()
+
+
+@st.cache_data
+def build_rsi_figure(data):
+    fig = px.line(
+        data, x=chart_dates(data.index), y="RSI", labels={"x": "Date", "RSI": "RSI"}
+    )
+    fig.add_hline(y=70, line_dash="dash", line_color="red")
+    fig.add_hline(y=30, line_dash="dash", line_color="green")
+    return fig.to_dict()
+
 
 st.subheader("Relative Strength Index (RSI)")
-fig_rsi = px.line(
-    stock_data, x=stock_data.index, y="RSI", labels={"index": "Date", "RSI": "RSI"}
-)
-fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
-fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
+fig_rsi = go.Figure(build_rsi_figure(stock_data[["RSI"]]))
 st.plotly_chart(fig_rsi, use_container_width=True)
 
-# Save the chart to an image for export
-with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp:
-    fig_rsi.write_image(temp.name)
-    rsi_chart_path = temp.name
-
 # Add Market Overview Section
 st.header("Market Overview")
 market_overview_option = st.selectbox(
@@ -206,33 +349,33 @@ market_overview_option = st.selectbox(
 )
 
 
-@st.cache_data
-def fetch_market_data():
-    try:
-        if market_overview_option == "Market Index Performance":
-            indices = ["SPY", "QQQ", "DIA"]
-            market_data = pd.DataFrame()
-            for index in indices:
-                data = obb.equity.price.historical(
-                    symbol=index, start_date=start_date.strftime("%Y-%m-%d")
-                ).to_dataframe()
-                market_data[index] = data["close"]
-            return market_data
-        elif market_overview_option == "Sector Performance":
-            return obb.economy.overview(interval="1d").to_dataframe()
-    except Exception as e:
-        st.error(f"Error fetching market data: {e}")
-        return None
-
-
-market_data = fetch_market_data()
-if market_data is not None:
-    st.plotly_chart(px.line(market_data), use_container_width=True)
+# Index closes go through the closed/live split; the sector snapshot is live data
+@st.cache_data(ttl=datetime.timedelta(minutes=5))
+def fetch_market_data(market_overview_option, start_date):
+    if market_overview_option == "Market Index Performance":
+        indices = ["SPY", "QQQ", "DIA"]
+        return fetch_close_prices(indices, start_date)
+    elif market_overview_option == "Sector Performance":
+        return obb.economy.overview(interval="1d").to_dataframe()
 
-# Save the chart to an image for export
-with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp:
-    px.line(market_data).write_image(temp.name)
-    market_chart_path = temp.name
+
+# Errors are handled outside the cached function so failures are not cached
+try:
+    market_data = fetch_market_data(market_overview_option, start_date)
+except Exception as e:
+    st.error(f"Error fetching market data: {e}")
+    market_data = None
+if market_data is not None:
+    if market_overview_option == "Market Index Performance":
+        fig_market = px.line(
+            market_data,
+            x=chart_dates(market_data.index),
+            y=list(market_data.columns),
+            labels={"x": "Date"},
+        )
+    else:
+        fig_market = px.line(market_data)
+    st.plotly_chart(fig_market, use_container_width=True)
 
 # Fundamental Analysis
 st.header("Fundamental Analysis")
@@ -243,7 +386,8 @@ statement_type = st.selectbox(
 )
 
 
-@st.cache_data
+# Fundamentals change with new filings, so they are refreshed daily
+@st.cache_data(ttl=datetime.timedelta(days=1), show_spinner=False)
 def fetch_financial_statement(ticker, statement_type):
     if statement_type == "Income Statement":
         data = obb.equity.fundamental.income(
@@ -258,8 +402,31 @@ def fetch_financial_statement(ticker, statement_type):
     return data
 
 
+# The other statements are fetched alongside the selected one, so switching between
+# them is a cache hit. Failures are not cached; a statement that failed is only
+# retried once it is selected, and its error only shows for that selection.
+def fetch_financial_statements(ticker, statement_type):
+    failed = st.session_state.setdefault("failed_statements", set())
+    names = [
+        name
+        for name in ["Income Statement", "Balance Sheet", "Cash Flow"]
+        if name == statement_type or (ticker, name) not in failed
+    ]
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        futures = {
+            name: executor.submit(fetch_financial_statement, ticker, name)
+            for name in names
+        }
+    for name, future in futures.items():
+        if future.exception() is None:
+            failed.discard((ticker, name))
+        else:
+            failed.add((ticker, name))
+    return futures[statement_type].result()
+
+
 try:
-    financial_data = fetch_financial_statement(ticker, statement_type)
+    financial_data = fetch_financial_statements(ticker, statement_type)
     st.subheader(f"{statement_type} for {ticker}")
     st.dataframe(financial_data)
 except Exception as e:
@@ -268,7 +435,7 @@ except Exception as e:
 st.subheader("Key Financial Ratios")
 
 
-@st.cache_data
+@st.cache_data(ttl=datetime.timedelta(days=1))
 def fetch_financial_ratios(ticker):
     data = obb.equity.fundamental.ratios(symbol=ticker).to_dataframe()
     return data
@@ -300,41 +467,57 @@ weights = [float(w) for w in weights_input.split(",")]
 if len(tickers) != len(weights):
     st.error("Number of tickers and weights must match.")
     st.stop()
-elif sum(weights) != 1:
+elif any(w < 0 for w in weights):
+    st.error("Weights must not be negative.")
+    st.stop()
+elif not math.isclose(sum(weights), 1.0, abs_tol=1e-6):
     st.error("Weights must sum up to 1.")
     st.stop()
 
-@st.cache_data
+# Not cached itself; the per-symbol history it reads is already cached
 def fetch_portfolio_data(tickers, start_date, end_date):
-    portfolio_data = pd.DataFrame()
-    for ticker in tickers:
-        data = obb.equity.price.historical(
-            symbol=ticker,
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d"),
-        ).to_dataframe()
-        portfolio_data[ticker] = data["close"]
-    return portfolio_data
+    return fetch_close_prices(tickers, start_date, end_date)
 
 portfolio_data = fetch_portfolio_data(tickers, start_date, end_date)
 
 # Calculate daily returns
 returns = portfolio_data.pct_change().dropna()
+asset_returns = returns.to_numpy()
+weights_array = np.asarray(weights, dtype=np.float64)
 
 # Calculate portfolio returns
-portfolio_returns = returns.dot(weights)
+portfolio_returns = asset_returns @ weights_array
 
 # Calculate cumulative returns
-cumulative_returns = (1 + portfolio_returns).cumprod()
+cumulative_returns = pd.Series(np.cumprod(1 + portfolio_returns), index=returns.index)
+
+
+@st.cache_data
+def build_portfolio_figure(cumulative_returns):
+    fig = px.line(
+        x=chart_dates(cumulative_returns.index),
+        y=cumulative_returns.to_numpy(),
+        labels={"x": "Date", "y": "Cumulative Returns"},
+    )
+    return fig.to_dict()
+
 
 st.subheader("Portfolio Cumulative Returns")
-fig_portfolio = px.line(cumulative_returns, labels={"index": "Date", "value": "Cumulative Returns"})
+fig_portfolio = go.Figure(build_portfolio_figure(cumulative_returns))
 st.plotly_chart(fig_portfolio, use_container_width=True)
 
+
+# The covariance depends only on prices, so changing the weights reuses it
+@st.cache_data
+def annualized_cov(asset_returns):
+    return np.atleast_2d(np.cov(asset_returns, rowvar=False)) * 252
+
+
 st.subheader("Portfolio Risk Metrics")
 
 # # Calculate metrics
-volatility = portfolio_returns.std() * (252 ** 0.5)
+cov = annualized_cov(asset_returns)
+volatility = np.sqrt(weights_array @ cov @ weights_array)
 annual_return = portfolio_returns.mean() * 252
 sharpe_ratio = annual_return / volatility
 
@@ -347,12 +530,48 @@ st.write(f"Sharpe Ratio: {sharpe_ratio:.2f}")
 st.header("Advanced Risk Analysis")
 if st.checkbox("Show Value at Risk (VaR) Analysis"):
     confidence_level = st.slider("Confidence Level", 0.9, 0.99, 0.95)
-    returns = stock_data["close"].pct_change().dropna()
-    var = returns.quantile(1 - confidence_level)
-    st.write(f"Value at Risk ({confidence_level*100}%): {var:.2%}")
+    if stock_returns.size:
+        var = np.quantile(stock_returns, 1 - confidence_level)
+        st.write(f"Value at Risk ({confidence_level*100}%): {var:.2%}")
+    else:
+        st.info("Not enough price history to compute Value at Risk.")
+
+
+# Render a chart to PNG; cached so re-exporting unchanged charts skips Kaleido
+@st.cache_data(max_entries=16, show_spinner=False)
+def render_png(fig_json):
+    return pio.to_image(pio.from_json(fig_json), format="png")
 
 
 if st.sidebar.button("Export Analysis to PDF"):
+    # Report dependencies are only needed here, so keep them off the startup path
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+
+    # Charts are only rendered to images when a report is requested, and only
+    # re-rendered when the figures themselves have changed
+    figure_jsons = [fig.to_json() for fig in [fig_price, fig_ma, fig_bb, fig_rsi]]
+    chart_key = hash(tuple(figure_jsons))
+    if st.session_state.get("chart_key") != chart_key:
+        with ThreadPoolExecutor(max_workers=len(figure_jsons)) as executor:
+            images = list(executor.map(render_png, figure_jsons))
+
+        # Reuse one directory per session, overwriting the same files on each export
+        if "tmpdir" not in st.session_state:
+            st.session_state.tmpdir = tempfile.mkdtemp()
+            atexit.register(shutil.rmtree, st.session_state.tmpdir, ignore_errors=True)
+        chart_paths = []
+        for name, image in zip(["price", "ma", "bb", "rsi"], images):
+            path = os.path.join(st.session_state.tmpdir, f"{name}.png")
+            with open(path, "wb") as chart_file:
+                chart_file.write(image)
+            chart_paths.append(path)
+        st.session_state.chart_key = chart_key
+        st.session_state.chart_paths = chart_paths
+    price_chart_path, ma_chart_path, bb_chart_path, rsi_chart_path = (
+        st.session_state.chart_paths
+    )
+
     buffer = io.BytesIO()
     p = canvas.Canvas(buffer, pagesize=letter)
     width, height = letter
@@ -365,13 +584,25 @@ if st.sidebar.button("Export Analysis to PDF"):
 
     # Adding Price Chart
     p.drawString(100, height - 100, "Closing Price Chart:")
-    price_chart_image = Image.open(price_chart_path)
-    p.drawImage(ImageReader(price_chart_image), 100, height - 400, width=400, height=250)
+    p.drawImage(
+        price_chart_path,
+        100,
+        height - 400,
+        width=400,
+        height=250,
+        preserveAspectRatio=True,
+    )
     
     # Adding Moving Averages Chart
     p.drawString(100, height - 430, "Price with Moving Averages:")
-    ma_chart_image = Image.open(ma_chart_path)
-    p.drawImage(ImageReader(ma_chart_image), 100, height - 730, width=400, height=250)
+    p.drawImage(
+        ma_chart_path,
+        100,
+        height - 730,
+        width=400,
+        height=250,
+        preserveAspectRatio=True,
+    )
     
     # New page for Bollinger Bands
     p.showPage()
@@ -379,8 +610,14 @@ if st.sidebar.button("Export Analysis to PDF"):
     p.drawString(100, height - 50, "Bollinger Bands Analysis")
     
     # Adding Bollinger Bands Chart
-    bb_chart_image = Image.open(bb_chart_path)
-    p.drawImage(ImageReader(bb_chart_image), 100, height - 400, width=400, height=250)
+    p.drawImage(
+        bb_chart_path,
+        100,
+        height - 400,
+        width=400,
+        height=250,
+        preserveAspectRatio=True,
+    )
     
     # New page for RSI
     p.showPage()
@@ -388,8 +625,14 @@ if st.sidebar.button("Export Analysis to PDF"):
     p.drawString(100, height - 50, "Relative Strength Index (RSI) Analysis")
     
     # Adding RSI Chart
-    rsi_chart_image = Image.open(rsi_chart_path)
-    p.drawImage(ImageReader(rsi_chart_image), 100, height - 400, width=400, height=250)
+    p.drawImage(
+        rsi_chart_path,
+        100,
+        height - 400,
+        width=400,
+        height=250,
+        preserveAspectRatio=True,
+    )
     
     # Finalize PDF
     p.showPage()